@@ -0,0 +1,161 @@
+"""
+Keyword matching for the DDR Keyword Risk Processor.
+
+Matching uses the fastest backend installed: Hyperscan, then Aho-Corasick,
+then RE2, each scanning a text once whatever the number of keywords, falling
+back to a plain substring check per keyword. The module is fully annotated so
+it can be compiled with mypyc (`mypyc kw_matcher.py`), though the gain is
+negligible. The extension is imported in place of this file, so rebuild or
+delete it after editing this file.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # optional, fall back to substring checks
+    ahocorasick = None  # type: ignore
+
+try:
+    import hyperscan  # type: ignore
+except ImportError:  # optional, fastest matcher when available
+    hyperscan = None  # type: ignore
+
+try:
+    import re2  # type: ignore
+except ImportError:  # optional, used instead of the substring fallback when available
+    re2 = None  # type: ignore
+
+# Maps a text to the set of lowercased keywords found in it
+Matcher = Callable[[str], Set[str]]
+
+
+def _no_match(text: str) -> Set[str]:
+    """Matcher for an empty keyword list."""
+    return set()
+
+
+def _automaton_matcher(keywords: Tuple[str, ...]) -> Matcher:
+    """Build a matcher backed by an Aho-Corasick automaton over the lowercased keywords."""
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        kw_lower = kw.lower()
+        automaton.add_word(kw_lower, kw_lower)
+    automaton.make_automaton()
+    total = len({kw.lower() for kw in keywords})
+
+    def match(text: str) -> Set[str]:
+        found: Set[str] = set()
+        for _, kw_lower in automaton.iter(text.lower()):
+            found.add(kw_lower)
+            # Every keyword has been seen; the rest of the text cannot add anything
+            if len(found) == total:
+                break
+        return found
+
+    return match
+
+
+def _substring_matcher(keywords: Tuple[str, ...]) -> Matcher:
+    """Build a dependency-free matcher that checks each lowercased keyword as a substring."""
+    lowered = tuple(dict.fromkeys(kw.lower() for kw in keywords))
+
+    def match(text: str) -> Set[str]:
+        text_lower = text.lower()
+        return {kw for kw in lowered if kw in text_lower}
+
+    return match
+
+
+def _re2_matcher(keywords: Tuple[str, ...]) -> Matcher:
+    """Build a matcher backed by an RE2 set, which reports every keyword found in one pass."""
+    options = re2.Options()
+    options.literal = True
+    # RE2's caseless mode folds more than str.lower() (e.g. U+017F to 's'), so the
+    # text is lowered in Python instead, as the original substring check did
+    options.case_sensitive = True
+    kw_set = re2.Set.SearchSet(options)
+    lowered: Dict[int, str] = {}
+    for kw in dict.fromkeys(kw.lower() for kw in keywords):
+        lowered[kw_set.Add(kw)] = kw
+    kw_set.Compile()
+
+    def match(text: str) -> Set[str]:
+        return {lowered[kw_id] for kw_id in kw_set.Match(text.lower()) or ()}
+
+    return match
+
+
+def _hyperscan_matcher(keywords: Tuple[str, ...]) -> Matcher:
+    """Build a matcher backed by a Hyperscan database of the lowercased keywords as literals."""
+    lowered = list(dict.fromkeys(kw.lower() for kw in keywords))
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[kw.encode('utf-8') for kw in lowered],
+        ids=list(range(len(lowered))),
+        # Report each keyword at most once per scan
+        flags=hyperscan.HS_FLAG_SINGLEMATCH,
+        literal=True,
+    )
+
+    def on_hit(kw_id: int, start: int, end: int, flags: int, found: Any) -> bool:
+        """Record the matched keyword id; returning True stops the scan once all have been seen."""
+        found.add(kw_id)
+        return len(found) == len(lowered)
+
+    def match(text: str) -> Set[str]:
+        found: Set[int] = set()
+        # Hyperscan only folds ASCII case, so the text is lowered in Python as the original
+        # substring check did; a UTF-8 byte match is then exactly a substring match
+        try:
+            db.scan(text.lower().encode('utf-8', 'surrogatepass'), match_event_handler=on_hit, context=found)
+        except hyperscan.ScanTerminated:
+            pass
+        return {lowered[kw_id] for kw_id in found}
+
+    return match
+
+
+@lru_cache(maxsize=None)
+def keyword_matcher(keywords: Tuple[str, ...]) -> Matcher:
+    """Return a function mapping text to the set of lowercased keywords found in it."""
+    if not keywords:
+        return _no_match
+    if hyperscan is not None:
+        return _hyperscan_matcher(keywords)
+    if ahocorasick is not None:
+        return _automaton_matcher(keywords)
+    if re2 is not None:
+        return _re2_matcher(keywords)
+    return _substring_matcher(keywords)
+
+
+@lru_cache(maxsize=4096)
+def _match_cached(text: str, keywords: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Matched keywords in keyword order, cached so repeated boilerplate details are matched once."""
+    found = keyword_matcher(keywords)(text)
+    if not found:
+        return ()
+    return tuple(kw for kw in keywords if kw.lower() in found)
+
+
+@lru_cache(maxsize=None)
+def _min_keyword_length(keywords: Tuple[str, ...]) -> int:
+    """Length of the shortest keyword; shorter text cannot contain any of them."""
+    return min(map(len, keywords), default=0)
+
+
+def clear_cache() -> None:
+    """Drop cached per-text matches."""
+    _match_cached.cache_clear()
+
+
+def search_keywords(text: str, keywords: List[str]) -> List[str]:
+    """Search for keywords in text (case-insensitive). Returns list of matched keywords."""
+    kw_tuple = tuple(keywords)
+    # Near-empty cells are common; bail out before touching the cache or the matcher
+    if len(text) < _min_keyword_length(kw_tuple) or text.isspace():
+        return []
+    # Single pass over the text regardless of how many keywords there are
+    return list(_match_cached(text, kw_tuple))
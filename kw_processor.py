@@ -6,11 +6,17 @@ in the "Details of Operations in Sequence and Remarks" column and outputs
 matches to a new Excel sheet.
 """
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 from pathlib import Path
 import re
 import pandas as pd
+import xlsxwriter
 from openpyxl import load_workbook
 
+from kw_matcher import clear_cache, keyword_matcher, search_keywords
+
 
 # Risk keywords to search for
 RISK_KEYWORDS = [
@@ -39,146 +45,192 @@ RISK_KEYWORDS = [
     "Shallow Gas Influx"
 ]
 
+# Columns of the risk analysis output
+RESULT_COLUMNS = ['Report Number', 'Time/Date', 'Risks']
+
+# Report number after "DDR" or "#" in DDR filenames
+REPORT_NUMBER_RE = re.compile(r'(?:DDR\s*#?\s*|#\s*)(\d+)', re.IGNORECASE)
+
 
 def extract_report_number(filepath: Path) -> str:
     """Extract report number from filename or return filename as identifier."""
     filename = filepath.stem
     # Try to extract number after "DDR" or "#"
-    match = re.search(r'(?:DDR\s*#?\s*|#\s*)(\d+)', filename, re.IGNORECASE)
+    match = REPORT_NUMBER_RE.search(filename)
     if match:
         return match.group(1)
     return filename
 
 
-def find_operations_column(df: pd.DataFrame) -> int:
-    """Find the column index containing 'DETAILS OF OPERATIONS IN SEQUENCE AND REMARKS'."""
-    for row_idx in range(min(100, len(df))):
-        for col_idx in range(len(df.columns)):
-            cell_value = df.iloc[row_idx, col_idx]
+def iter_sheet_rows(filepath: Path):
+    """
+    Yield one iterator of row value tuples per sheet in the workbook.
+    .xlsx files are streamed with openpyxl in read-only mode; legacy .xls files are read with pandas,
+    skipping sheets that have no operations header in their first 100 rows.
+    """
+    if filepath.suffix.lower() == '.xls':
+        with pd.ExcelFile(filepath) as xl:
+            for sheet_name in xl.sheet_names:
+                # Only convert the whole sheet if its first rows hold the operations header
+                head = pd.read_excel(xl, sheet_name=sheet_name, header=None, nrows=100)
+                if find_operations_column(head.itertuples(index=False, name=None)) == -1:
+                    continue
+                df = pd.read_excel(xl, sheet_name=sheet_name, header=None)
+                # Report empty cells as None, like openpyxl does
+                df = df.astype(object).where(df.notna(), None)
+                yield df.itertuples(index=False, name=None)
+        return
+
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            # Sheet dimensions recorded in the file are not always accurate
+            ws.reset_dimensions()
+            yield ws.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def find_operations_column(rows) -> int:
+    """
+    Find the column index containing 'DETAILS OF OPERATIONS IN SEQUENCE AND REMARKS'.
+    Consumes rows up to and including the header row; returns -1 if it is not in the first 100 rows.
+    """
+    for row in islice(rows, 100):
+        for col_idx, cell_value in enumerate(row):
             if isinstance(cell_value, str) and 'DETAILS OF OPERATIONS' in cell_value.upper():
                 return col_idx
     return -1
 
 
-def find_operations_data(df: pd.DataFrame, ops_col: int) -> list:
+def find_operations_data(rows, ops_col: int):
     """
     Extract operations data rows with their time information.
-    Returns list of dicts with 'time_from', 'time_to', 'details'.
+    Expects rows positioned just after the header row. Yields (time_date, details) tuples.
     """
-    results = []
+    # Skip the FROM/TO/DURATION row under the header
+    next(rows, None)
 
-    # Find the header row for operations
-    header_row = -1
-    for row_idx in range(min(100, len(df))):
-        cell_value = df.iloc[row_idx, ops_col]
-        if isinstance(cell_value, str) and 'DETAILS OF OPERATIONS' in cell_value.upper():
-            header_row = row_idx
-            break
-
-    if header_row == -1:
-        return results
-
-    # Data starts after the header rows (typically 2 rows: header + FROM/TO/DURATION row)
-    data_start = header_row + 2
-
-    for row_idx in range(data_start, len(df)):
+    for row in rows:
         # Get the details text from operations column
-        details = df.iloc[row_idx, ops_col]
+        details = row[ops_col] if ops_col < len(row) else None
 
-        # Skip empty rows or rows that are section headers
-        if pd.isna(details) or not isinstance(details, str) or details.strip() == '':
-            # Check if this is a section break (like TOTAL row or new section)
-            col0_val = df.iloc[row_idx, 0]
-            if isinstance(col0_val, str) and ('TOTAL' in col0_val.upper() or 'SUMMARY' in col0_val.upper()):
-                continue
+        # Skip empty rows or rows that are section headers (isspace() avoids a stripped copy)
+        if not isinstance(details, str) or not details or details.isspace():
             continue
 
         # Get time information (columns 0 and 1 typically have FROM and TO times)
-        time_from = df.iloc[row_idx, 0]
-        time_to = df.iloc[row_idx, 1]
+        time_from = row[0]
+        time_to = row[1] if len(row) > 1 else None
 
         # Format time/date
         time_str = ""
-        if pd.notna(time_from):
+        if time_from is not None:
             if isinstance(time_from, pd.Timestamp):
                 time_str = time_from.strftime('%Y-%m-%d %H:%M')
             else:
                 time_str = str(time_from)
-        if pd.notna(time_to):
+        if time_to is not None:
             if isinstance(time_to, pd.Timestamp):
                 time_str += f" to {time_to.strftime('%H:%M')}"
             elif time_str:
                 time_str += f" to {time_to}"
 
-        results.append({
-            'time_date': time_str,
-            'details': details
-        })
-
-    return results
-
-
-def search_keywords(text: str, keywords: list) -> list:
-    """Search for keywords in text (case-insensitive). Returns list of matched keywords."""
-    matched = []
-    text_lower = text.lower()
-    for kw in keywords:
-        if kw.lower() in text_lower:
-            matched.append(kw)
-    return matched
+        yield time_str, details
 
 
 def process_ddr_file(filepath: Path, keywords: list) -> list:
     """
     Process a single DDR Excel file and return list of risk matches.
-    Each match contains: report_number, time_date, risks
+    Each match is a (report_number, time_date, risks) tuple, in RESULT_COLUMNS order.
     """
     results = []
     report_number = extract_report_number(filepath)
 
-    # Read Excel file
-    xl = pd.ExcelFile(filepath)
-
-    for sheet_name in xl.sheet_names:
-        df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
-
+    # Stream each sheet once: header detection and extraction share the same row iterator
+    for rows in iter_sheet_rows(filepath):
         # Find the operations column
-        ops_col = find_operations_column(df)
+        ops_col = find_operations_column(rows)
         if ops_col == -1:
             continue
 
         # Extract operations data
-        operations = find_operations_data(df, ops_col)
+        operations = list(find_operations_data(rows, ops_col))
+
+        # Match the whole column in one pass first; most sheets contain no keywords at all
+        column_text = '\n'.join(details for _, details in operations)
+        if not keyword_matcher(tuple(keywords))(column_text):
+            continue
 
-        for op in operations:
-            matched_keywords = search_keywords(op['details'], keywords)
+        for time_date, details in operations:
+            matched_keywords = search_keywords(details, keywords)
             if matched_keywords:
-                results.append({
-                    'Report Number': report_number,
-                    'Time/Date': op['time_date'],
-                    'Risks': ', '.join(matched_keywords)
-                })
+                results.append((report_number, time_date, ', '.join(matched_keywords)))
 
     return results
 
 
+def _process_file(filepath: Path, keywords: list) -> tuple:
+    """Worker entry point: process one file and return (filename, results, error message)."""
+    try:
+        return filepath.name, process_ddr_file(filepath, keywords), None
+    except Exception as e:
+        return filepath.name, [], str(e)
+
+
 def process_all_files(input_folder: Path, keywords: list) -> pd.DataFrame:
-    """Process all Excel files in the input folder."""
+    """Process all Excel files in the input folder, in parallel across CPU cores."""
     all_results = []
 
     # Find all Excel files
     excel_files = list(input_folder.glob('*.xlsx')) + list(input_folder.glob('*.xls'))
 
-    for filepath in excel_files:
-        print(f"Processing: {filepath.name}")
-        try:
-            results = process_ddr_file(filepath, keywords)
-            all_results.extend(results)
+    # Files are independent; results are reported as they finish and kept in file order by index
+    file_results = [[] for _ in excel_files]
+    # Matching runs in the workers; forked workers would otherwise inherit the parent's cached matches
+    with ProcessPoolExecutor(initializer=clear_cache) as pool:
+        futures = {pool.submit(_process_file, filepath, keywords): idx for idx, filepath in enumerate(excel_files)}
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                filename, results, error = future.result()
+            except BrokenProcessPool as e:
+                # A worker died (e.g. killed for memory); report its files instead of losing the run
+                filename, results, error = excel_files[idx].name, [], str(e)
+            print(f"Done: {filename}")
+            if error is not None:
+                print(f"  Error processing file: {error}")
+                continue
+            file_results[idx] = results
             print(f"  Found {len(results)} risk entries")
-        except Exception as e:
-            print(f"  Error processing file: {e}")
 
-    return pd.DataFrame(all_results)
+    for results in file_results:
+        all_results.extend(results)
+
+    return pd.DataFrame.from_records(all_results, columns=RESULT_COLUMNS)
+
+
+def _has_other_sheets(output_path: Path, sheet_name: str) -> bool:
+    """Check whether an existing workbook has sheets other than sheet_name."""
+    wb = load_workbook(output_path, read_only=True)
+    try:
+        return any(name != sheet_name for name in wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def _write_new_workbook(df: pd.DataFrame, output_path: Path, sheet_name: str):
+    """Write df as the only sheet of a new workbook, streaming rows to disk."""
+    # pandas writes cells column by column, which constant_memory mode does not support,
+    # so rows are written directly in order
+    workbook = xlsxwriter.Workbook(str(output_path), {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, list(df.columns))
+        for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            worksheet.write_row(row_idx, 0, row)
+    finally:
+        workbook.close()
 
 
 def save_results(df: pd.DataFrame, output_path: Path, sheet_name: str = 'Risk Analysis'):
@@ -187,13 +239,13 @@ def save_results(df: pd.DataFrame, output_path: Path, sheet_name: str = 'Risk An
         print("No results to save.")
         return
 
-    if output_path.exists():
-        # Append to existing file
+    if output_path.exists() and _has_other_sheets(output_path, sheet_name):
+        # Append to existing file, keeping its other sheets
         with pd.ExcelWriter(output_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
             df.to_excel(writer, sheet_name=sheet_name, index=False)
     else:
-        # Create new file
-        df.to_excel(output_path, sheet_name=sheet_name, index=False)
+        # Nothing else to keep: write a fresh file without reading the old one
+        _write_new_workbook(df, output_path, sheet_name)
 
     print(f"Results saved to: {output_path}")
 
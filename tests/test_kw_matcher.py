@@ -0,0 +1,108 @@
+import pytest
+
+import kw_matcher
+from kw_matcher import search_keywords
+from kw_processor import RISK_KEYWORDS
+
+# Matcher builders and the optional module each one needs. Builders are called
+# directly rather than by hiding modules from keyword_matcher, because patching
+# module globals has no effect once kw_matcher is compiled with mypyc.
+BUILDERS = {
+    "_hyperscan_matcher": "hyperscan",
+    "_automaton_matcher": "ahocorasick",
+    "_re2_matcher": "re2",
+    "_substring_matcher": None,
+}
+
+TEXTS = [
+    "MUD LOSSES observed while drilling",
+    "Differential sticking suspected, worked string free",
+    "differential pressure high; HIGH TRQ and drag",
+    "Pack-off, STICK SLIP, shallow gas influx, kick",
+    "Continue drilling 12 1/4'' hole",
+    # Lowered by str.lower() to 'kick'; not folded by ASCII-only caseless matching
+    "\u212aICK happened",
+    # Long s is already lowercase for str.lower(), though Unicode case folding maps it to 's'
+    "\u017ftuck pipe",
+]
+
+
+def baseline_search(text, keywords):
+    """The original substring loop every backend must agree with."""
+    text_lower = text.lower()
+    return [kw for kw in keywords if kw.lower() in text_lower]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    kw_matcher.clear_cache()
+    yield
+    kw_matcher.clear_cache()
+
+
+@pytest.fixture(params=list(BUILDERS))
+def builder(request):
+    """One backend's matcher builder."""
+    module = BUILDERS[request.param]
+    if module is not None and getattr(kw_matcher, module) is None:
+        pytest.skip(f"{module} is not installed")
+    return getattr(kw_matcher, request.param)
+
+
+@pytest.fixture
+def matcher(builder):
+    """A matcher over RISK_KEYWORDS built by one backend."""
+    return builder(tuple(RISK_KEYWORDS))
+
+
+def expected_found(text):
+    return {kw.lower() for kw in baseline_search(text, RISK_KEYWORDS)}
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matcher_matches_baseline(matcher, text):
+    assert matcher(text) == expected_found(text)
+
+
+def test_matcher_overlapping(matcher):
+    assert matcher("Differential sticking") == {"differential sticking", "differential"}
+    assert matcher("MUD LOSSES") == {"mud loss", "losses"}
+
+
+def test_matcher_duplicate_keyword(matcher):
+    assert matcher("lost WELL CONTROL") == {"well control"}
+
+
+def test_matcher_non_ascii_keyword(builder):
+    keywords = ("Überdruck", "Kick")
+    assert builder(keywords)("ÜBERDRUCK im Bohrloch") == {"überdruck"}
+    assert builder(keywords)("uberdruck") == set()
+
+
+@pytest.mark.parametrize("text", ["", " ", "   \t\n", "KIC", "x"])
+def test_matcher_short_or_blank(matcher, text):
+    assert matcher(text) == set()
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_search_keywords_matches_baseline(text):
+    assert search_keywords(text, RISK_KEYWORDS) == baseline_search(text, RISK_KEYWORDS)
+
+
+def test_search_keywords_overlapping():
+    assert search_keywords("Differential sticking", RISK_KEYWORDS) == ["Differential sticking", "Differential"]
+    assert search_keywords("MUD LOSSES", RISK_KEYWORDS) == ["Mud loss", "losses"]
+
+
+def test_search_keywords_duplicate_keyword():
+    # "Well control" is listed twice in RISK_KEYWORDS
+    assert search_keywords("lost WELL CONTROL", RISK_KEYWORDS) == ["Well control", "Well control"]
+
+
+def test_search_keywords_empty_keywords():
+    assert search_keywords("stuck pipe", []) == []
+
+
+@pytest.mark.parametrize("text", ["", " ", "   \t\n", "KIC", "x"])
+def test_search_keywords_short_or_blank(text):
+    assert search_keywords(text, RISK_KEYWORDS) == []
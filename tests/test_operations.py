@@ -0,0 +1,94 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+
+from kw_processor import find_operations_column, find_operations_data, iter_sheet_rows
+
+OPS_COL = 3
+
+# DDR_ROWS written with xlwt as a real BIFF .xls file, read through xlrd
+XLS_FIXTURE = Path(__file__).parent / "data" / "DDR # 12.xls"
+
+DDR_ROWS = [
+    ["DAILY DRILLING REPORT"],
+    [],
+    [None, None, None, "DETAILS OF OPERATIONS IN SEQUENCE AND REMARKS"],
+    ["FROM", "TO", "HRS", None],
+    [datetime(2024, 1, 1, 6, 0), datetime(2024, 1, 1, 12, 0), 6, "Drilled ahead, high TRQ"],
+    [datetime(2024, 1, 1, 12, 0), datetime(2024, 1, 1, 13, 0), 1, "   "],
+    # Ragged row that stops before the operations column
+    [datetime(2024, 1, 1, 13, 0)],
+    [datetime(2024, 1, 1, 23, 0), datetime(2024, 1, 2, 1, 0), 2, "Stuck pipe, worked free"],
+    [datetime(2024, 1, 2, 1, 0), None, None, "Pull out of hole"],
+    ["NOTE", None, None, "Mud losses while circulating"],
+]
+
+EXPECTED = [
+    ("2024-01-01 06:00:00 to 2024-01-01 12:00:00", "Drilled ahead, high TRQ"),
+    ("2024-01-01 23:00:00 to 2024-01-02 01:00:00", "Stuck pipe, worked free"),
+    ("2024-01-02 01:00:00", "Pull out of hole"),
+    ("NOTE", "Mud losses while circulating"),
+]
+
+
+def write_ddr(path):
+    """Save a workbook with a cover sheet and a DDR sheet built from DDR_ROWS."""
+    wb = Workbook()
+    wb.active.title = "Cover"
+    wb.active.append(["Well report cover page"])
+    ws = wb.create_sheet("DDR")
+    for row in DDR_ROWS:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def extract(path):
+    """Run the streaming pipeline over every sheet that has an operations column."""
+    sheets = []
+    for rows in iter_sheet_rows(path):
+        ops_col = find_operations_column(rows)
+        if ops_col != -1:
+            sheets.append(list(find_operations_data(rows, ops_col)))
+    return sheets
+
+
+def test_extracts_operations_rows(tmp_path):
+    path = write_ddr(tmp_path / "DDR # 12.xlsx")
+    assert extract(path) == [EXPECTED]
+
+
+def test_extracts_operations_rows_pandas_branch_by_suffix(tmp_path):
+    # An xlsx saved under a .xls name: the suffix sends it down the pandas branch,
+    # but pandas detects the content and reads it with openpyxl, not xlrd
+    path = write_ddr(tmp_path / "DDR # 12.xls")
+    assert extract(path) == [EXPECTED]
+
+
+def test_extracts_operations_rows_xls():
+    pytest.importorskip("xlrd")
+    assert extract(XLS_FIXTURE) == [EXPECTED]
+
+
+def test_find_operations_column_consumes_shared_iterator(tmp_path):
+    path = write_ddr(tmp_path / "DDR # 12.xlsx")
+    sheets = iter_sheet_rows(path)
+    # Sheets are read lazily from the open workbook, so take them one at a time
+    assert find_operations_column(next(sheets)) == -1
+    ddr = next(sheets)
+    assert find_operations_column(ddr) == OPS_COL
+    # The next row is the FROM/TO row that find_operations_data skips
+    assert next(ddr)[:2] == ("FROM", "TO")
+    sheets.close()
+
+
+def test_xls_blank_cells_are_none():
+    pytest.importorskip("xlrd")
+    # xlrd pads rows to the sheet width and pandas reports blanks as NaN
+    (rows,) = iter_sheet_rows(XLS_FIXTURE)
+    rows = list(rows)
+    ragged = [row for row in rows if row[0] == datetime(2024, 1, 1, 13, 0)]
+    assert ragged == [(datetime(2024, 1, 1, 13, 0), None, None, None)]
+    assert not any(isinstance(value, float) and value != value for row in rows for value in row)
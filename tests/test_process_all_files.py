@@ -0,0 +1,90 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from openpyxl import Workbook
+
+import kw_processor
+from kw_processor import RISK_KEYWORDS, process_all_files
+
+OPS_ROWS = {
+    "DDR # 1.xlsx": ["Drilled ahead with high TRQ", "Routine survey", "Stuck pipe"],
+    "DDR # 2.xlsx": ["Mud loss while circulating"],
+    "DDR # 3.xlsx": ["Kick detected, shut in well"],
+}
+
+
+def write_ddr(path, details):
+    """Save a minimal DDR workbook with one operations row per details string."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append([None, None, "DETAILS OF OPERATIONS IN SEQUENCE AND REMARKS"])
+    ws.append(["FROM", "TO", None])
+    for hour, text in enumerate(details):
+        ws.append([f"{hour:02d}:00", f"{hour + 1:02d}:00", text])
+    wb.save(path)
+
+
+def write_inputs(folder):
+    for name, details in OPS_ROWS.items():
+        write_ddr(folder / name, details)
+    (folder / "DDR # 4 corrupt.xlsx").write_bytes(b"not a zip file")
+
+
+def expected_reports(folder):
+    """Report numbers in the order process_all_files lists the input files, one per matching row."""
+    reports = []
+    for path in folder.glob('*.xlsx'):
+        for text in OPS_ROWS.get(path.name, []):
+            if kw_processor.search_keywords(text, RISK_KEYWORDS):
+                reports.append(kw_processor.extract_report_number(path))
+    return reports
+
+
+def test_process_all_files_continues_past_bad_file(tmp_path, capsys):
+    write_inputs(tmp_path)
+    df = process_all_files(tmp_path, RISK_KEYWORDS)
+
+    assert list(df["Report Number"]) == expected_reports(tmp_path)
+    assert list(df["Risks"][df["Report Number"] == "1"]) == ["High TRQ", "Stuck"]
+    out = capsys.readouterr().out
+    assert out.count("Done: ") == 4
+    assert out.count("Error processing file") == 1
+
+
+class InlinePool:
+    """Stands in for ProcessPoolExecutor, running calls in-process; 'crash' files fail like a dead worker."""
+
+    def __init__(self, initializer=None):
+        if initializer is not None:
+            initializer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, filepath, *args):
+        future = Future()
+        if "crash" in filepath.name:
+            future.set_exception(BrokenProcessPool("worker died"))
+        else:
+            future.set_result(fn(filepath, *args))
+        return future
+
+
+def test_process_all_files_keeps_file_order_and_reports_dead_worker(tmp_path, monkeypatch, capsys):
+    write_inputs(tmp_path)
+    (tmp_path / "DDR # 4 corrupt.xlsx").unlink()
+    write_ddr(tmp_path / "DDR # 5 crash.xlsx", ["Stuck pipe"])
+    monkeypatch.setattr(kw_processor, "ProcessPoolExecutor", InlinePool)
+    # Hand results back in reverse submission order
+    monkeypatch.setattr(kw_processor, "as_completed", lambda futures: reversed(list(futures)))
+
+    df = process_all_files(tmp_path, RISK_KEYWORDS)
+
+    # The crashed file contributes no rows; the others stay in file order
+    assert list(df["Report Number"]) == expected_reports(tmp_path)
+    out = capsys.readouterr().out
+    assert "Done: DDR # 5 crash.xlsx\n  Error processing file: worker died\n" in out
+    assert out.count("Done: ") == 4
@@ -0,0 +1,55 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+from kw_processor import RESULT_COLUMNS, save_results
+
+SHEET = "Risk Analysis"
+
+RESULTS = pd.DataFrame.from_records([
+    ("01", "2019-05-05 06:00:00 to 2019-05-05 09:00:00", "Torque, Drag"),
+    ("01", "2019-05-05 09:00:00 to 2019-05-05 12:00:00", "Stuck"),
+    ("12", "2019-05-16 23:00:00 to 2019-05-17 01:00:00", "Mud loss, losses"),
+], columns=RESULT_COLUMNS)
+
+OLD_RESULTS = pd.DataFrame.from_records([
+    ("99", "old", "Kick"),
+], columns=RESULT_COLUMNS)
+
+
+def read_sheet(path, sheet_name=SHEET):
+    return pd.read_excel(path, sheet_name=sheet_name, dtype=str)
+
+
+def test_save_results_new_file(tmp_path):
+    path = tmp_path / "risk_analysis.xlsx"
+    save_results(RESULTS, path)
+    assert load_workbook(path).sheetnames == [SHEET]
+    pd.testing.assert_frame_equal(read_sheet(path), RESULTS)
+
+
+def test_save_results_replaces_results_only_file(tmp_path):
+    path = tmp_path / "risk_analysis.xlsx"
+    save_results(OLD_RESULTS, path)
+    save_results(RESULTS, path)
+    assert load_workbook(path).sheetnames == [SHEET]
+    pd.testing.assert_frame_equal(read_sheet(path), RESULTS)
+
+
+def test_save_results_keeps_other_sheets(tmp_path):
+    path = tmp_path / "risk_analysis.xlsx"
+    notes = pd.DataFrame({"Well": ["Miraj-1"], "Note": ["spud 05-05-19"]})
+    with pd.ExcelWriter(path) as writer:
+        notes.to_excel(writer, sheet_name="Notes", index=False)
+        OLD_RESULTS.to_excel(writer, sheet_name=SHEET, index=False)
+
+    save_results(RESULTS, path)
+
+    assert sorted(load_workbook(path).sheetnames) == sorted(["Notes", SHEET])
+    pd.testing.assert_frame_equal(read_sheet(path), RESULTS)
+    pd.testing.assert_frame_equal(read_sheet(path, "Notes"), notes)
+
+
+def test_save_results_empty_frame(tmp_path):
+    path = tmp_path / "risk_analysis.xlsx"
+    save_results(pd.DataFrame(columns=RESULT_COLUMNS), path)
+    assert not path.exists()